@@ -1,11 +1,62 @@
+import io
 import json
 import re
 import csv
 import math
+import os
 import sys
+import threading
+import numpy as np
+import pandas as pd
 import streamlit as st
 from datetime import datetime
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter, defaultdict, OrderedDict
+from functools import lru_cache, wraps
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Name extraction patterns, compiled once at import.
+# The "... from <name> for Deel" prefixes are one alternation; the looser forms are tried after it, in order.
+_MASTER_EXTRACT = re.compile(
+    r'(?:Deel payment from|Transfer from|Payment from|Received from|Request from|From)\s+(?P<name>[^,]+?)\s+for\s+Deel',
+    re.IGNORECASE
+)
+# With google-re2 installed every extraction pattern runs on RE2's linear-time engine;
+# the .* fallbacks backtrack quadratically under re on long descriptions.
+# Input is whitespace-collapsed first, so RE2's ASCII-only \s matches the same text.
+def _extract_regex(pattern):
+    """Compile a case-insensitive extraction pattern, on RE2 when available"""
+    return re2.compile('(?i)' + pattern) if re2 is not None else re.compile(pattern, re.IGNORECASE)
+
+_MASTER_SEARCH = _extract_regex(_MASTER_EXTRACT.pattern) if re2 is not None else _MASTER_EXTRACT
+_EXTRACT_PATTERNS = (_MASTER_SEARCH,) + tuple(_extract_regex(p) for p in [
+    r'From\s+([^,]+?)\s+,\s+for\s+Deel',
+    r'From\s+([^,]+?)\s+,\s+ref.*for\s+Deel',
+    r'From\s+([^,]+?)\s+ref.*for\s+Deel',
+    r'ref.*From\s+([^,]+?)\s+for\s+Deel'
+])
+_NAME_PATTERNS = tuple(re.compile(p) for p in [
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
+    r'([A-Z][a-z]+\s+[A-Z][a-z]+)',
+])
+_CLEAN_NONWORD = re.compile(r'[^\w\s\.\-]')
+_COLLAPSE_WS = re.compile(r'\s+')
+_TRAIL_DIGITS = re.compile(r'\s+\d+$')
+_TRAIL_SUFFIX = re.compile(r'\s+(jr|sr|ii|iii|iv|test|debit|credit|err#)$', re.IGNORECASE)
+_FIRST_LAST = re.compile(r'^(\S+)\s.*?(\S+)$')
+_WORD_RE = re.compile(r'[a-z]+')
+_TOKEN_RE = re.compile(r'\b\w+\b')
+_NUM_RE = re.compile(r'\d+')
 
 # Streamlit configuration
 st.set_page_config(
@@ -15,452 +66,483 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Bundled assets live next to this file, whatever directory the app is launched from
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # CSS styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1E3A8A;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #3B82F6;
-        margin-top: 1.5rem;
-        margin-bottom: 1rem;
-        border-bottom: 2px solid #E5E7EB;
-        padding-bottom: 0.5rem;
-    }
-    .success-box {
-        background-color: #D1FAE5;
-        border-left: 4px solid #10B981;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    .info-box {
-        background-color: #DBEAFE;
-        border-left: 4px solid #3B82F6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    .warning-box {
-        background-color: #FEF3C7;
-        border-left: 4px solid #F59E0B;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    .error-box {
-        background-color: #FEE2E2;
-        border-left: 4px solid #EF4444;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    .transaction-card {
-        background-color: #F8FAFC;
-        border: 1px solid #E2E8F0;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        margin: 0.5rem 0;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        text-align: center;
-    }
-    .stButton > button {
-        width: 100%;
-        border-radius: 0.5rem;
-        font-weight: bold;
-    }
-    .json-output {
-        background-color: #1E1E1E;
-        color: #D4D4D4;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        font-family: 'Courier New', monospace;
-        font-size: 0.9rem;
-        overflow-x: auto;
-        margin: 1rem 0;
-        border: 1px solid #444;
-    }
-    .json-key {
-        color: #9CDCFE;
-    }
-    .json-string {
-        color: #CE9178;
-    }
-    .json-number {
-        color: #B5CEA8;
-    }
-    .json-boolean {
-        color: #569CD6;
-    }
-    .delete-button {
-        background-color: #EF4444 !important;
-        color: white !important;
-        border: none !important;
-    }
-    .delete-button:hover {
-        background-color: #DC2626 !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def _css():
+    """Read the app stylesheet once"""
+    with open(os.path.join(_APP_DIR, 'styles.css'), 'r', encoding='utf-8') as f:
+        return f.read()
+
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
+
+# 1 MiB write buffer so large saves go out in few write() calls
+_WRITE_BUFFER_SIZE = 1 << 20
+_TX_CSV_HEADER = ('id', 'amount ($)', 'description')
+_USER_CSV_HEADER = ('id', 'name')
+
+# Statistics transaction types; a description counts under the first one it contains
+_TX_KEYWORDS = ('payment', 'salary', 'contract', 'invoice', 'bonus', 'transfer', 'received', 'request')
+
+# Search/match results kept per DeelTransactionSystem
+_QUERY_CACHE_SIZE = 256
+
+def _tx_keyword(desc_lower):
+    """First of _TX_KEYWORDS found in a lowercased description, or None"""
+    return next((k for k in _TX_KEYWORDS if k in desc_lower), None)
+
+def _to_cents(amount):
+    """Convert a dollar amount to integer cents"""
+    return int(round(float(amount) * 100))
+
+def _pack_bits(rows, cols, n_rows, n_bits):
+    """Pack (row, bit) pairs into an (n_rows, ceil(n_bits/64)) uint64 bitset matrix"""
+    bits = np.zeros((n_rows, (n_bits + 63) // 64), dtype=np.uint64)
+    cols = np.asarray(cols, dtype=np.uint64)
+    np.bitwise_or.at(bits, (np.asarray(rows, dtype=np.intp), (cols // 64).astype(np.intp)),
+                     np.left_shift(np.uint64(1), cols % np.uint64(64)))
+    return bits
+
+def _grow(arr, n):
+    """arr if it has room for n rows, else a zero-padded copy with at least double the capacity"""
+    if n <= len(arr):
+        return arr
+    grown = np.zeros((max(n, 2 * len(arr)),) + arr.shape[1:], dtype=arr.dtype)
+    grown[:len(arr)] = arr
+    return grown
+
+def _posting_remove(postings, key, slot):
+    """Remove slot from the ascending posting list under key, dropping the key once it is empty"""
+    slots = postings[key]
+    del slots[bisect_left(slots, slot)]
+    if not slots:
+        del postings[key]
+
+# np.bitwise_count needs NumPy 2.0; older versions count unpacked bytes
+if hasattr(np, 'bitwise_count'):
+    def _popcount_rows(bits):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+else:
+    def _popcount_rows(bits):
+        return np.unpackbits(bits.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+def _json_bytes(data):
+    """Serialize data for the JSON download button"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Above this size st.json's collapsible tree gets sluggish in the browser
+_JSON_TREE_MAX_CHARS = 65_536
+
+# The Delete Transaction search stops scanning after this many matches
+_DELETE_SEARCH_LIMIT = 50
 
 def display_json(data, title="JSON Output"):
     """Display JSON data in a formatted way"""
     st.markdown(f"<h4>{title}</h4>", unsafe_allow_html=True)
     
-    # Format JSON with syntax highlighting
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
+    # Serialize once; the preview and the download share the same bytes
+    raw = _json_bytes(data)
     
-    # Simple syntax highlighting
-    json_str = json_str.replace('"', '<span class="json-string">"</span>')
-    json_str = json_str.replace(': ', ': <span class="json-key">')
-    json_str = json_str.replace(',\n', '</span>,\n')
-    json_str = json_str.replace('{\n', '{<br>')
-    json_str = json_str.replace('\n}', '<br>}')
-    json_str = json_str.replace('\n    ', '<br>    ')
-    
-    st.markdown(f'<div class="json-output">{json_str}</div>', unsafe_allow_html=True)
+    # Rendered and highlighted client-side; large payloads skip the tree view
+    json_str = raw.decode('utf-8')
+    if len(json_str) > _JSON_TREE_MAX_CHARS:
+        st.code(json_str, language='json')
+    else:
+        st.json(json_str, expanded=False)
     
     # Also provide a download button
     st.download_button(
         label="📥 Download JSON",
-        data=json.dumps(data, indent=2, ensure_ascii=False),
+        data=raw,
         file_name=f"{title.lower().replace(' ', '_')}.json",
         mime="application/json"
     )
 
+def _read_transactions_csv():
+    """Read transactions.csv as strings; rows with extra fields keep their leading ones, as csv.DictReader did"""
+    options = dict(encoding='utf-8', dtype=str, keep_default_na=False)
+    try:
+        return pd.read_csv('transactions.csv', engine='c', **options)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+    except pd.errors.ParserError:
+        # The C parser rejects ragged rows outright; the python engine can trim them
+        n_cols = len(pd.read_csv('transactions.csv', nrows=0, **options).columns)
+        return pd.read_csv('transactions.csv', engine='python', on_bad_lines=lambda fields: fields[:n_cols], **options)
+
+@st.cache_data(show_spinner=False)
+def _load_csv_data():
+    """Parse transactions.csv and users.csv, cached across reruns; None for a file that doesn't exist"""
+    # Load transactions from CSV format; the header row gives the schema
+    try:
+        transactions = _transactions_from_frame(_read_transactions_csv())
+    except FileNotFoundError:
+        transactions = None
+    
+    # Load users from CSV format
+    try:
+        with open('users.csv', 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            users = [
+                {
+                    'id': row.get('id', ''),
+                    'name': row.get('name', ''),
+                } for row in reader
+            ]
+    except FileNotFoundError:
+        users = None
+    
+    return transactions, users
+
+def _transactions_from_frame(df):
+    """Transaction records from the raw transactions.csv frame"""
+    # Resolve the schema once from the header instead of probing each row
+    amount_col = 'amount ($)' if 'amount ($)' in df.columns else 'amount'
+    for col in ('id', amount_col, 'description'):
+        if col not in df.columns:
+            df[col] = ''
+    
+    amounts = df[amount_col].str.replace(r'[\$,]', '', regex=True).str.strip()
+    df['amount'] = pd.to_numeric(amounts, errors='coerce').fillna(0.0).astype(float)
+    
+    return df[['id', 'amount', 'description']].to_dict('records')
+
+def _append_csv_row(path, header, row):
+    """Append one row to a CSV laid out as save_to_csv writes it; False if it isn't"""
+    buf = io.StringIO()
+    csv.writer(buf, quoting=csv.QUOTE_MINIMAL, lineterminator='\n').writerow(row)
+    try:
+        with open(path, 'rb+') as f:
+            # Only safe when the columns line up and the last row is terminated
+            if f.readline() != (','.join(header) + '\n').encode('utf-8'):
+                return False
+            f.seek(-1, io.SEEK_END)
+            if f.read(1) != b'\n':
+                return False
+            f.seek(0, io.SEEK_END)
+            f.write(buf.getvalue().encode('utf-8'))
+    except FileNotFoundError:
+        return False
+    _load_csv_data.clear()
+    return True
+
+def _synchronized(method):
+    """Serialize calls on a system instance shared across sessions"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class DeelTransactionSystem:
     def __init__(self):
         self.transactions = []
         self.users = []
+        self._lock = threading.RLock()
+        # Bumped on every add/delete; part of every query cache key
+        self._data_version = 0
+        self._query_cache = OrderedDict()
         self.load_or_create_data()
+        self._index_transactions()
+        self._index_users()
         
     def load_or_create_data(self):
         """Load data from files or create sample data"""
-        try:
-            # Load transactions from CSV format
-            with open('transactions.csv', 'r', encoding='utf-8') as f:
-                first_line = f.readline()
-                f.seek(0)
-                
-                if ',' in first_line:
-                    reader = csv.DictReader(f)
-                    self.transactions = []
-                    for row in reader:
-                        amount_str = row.get('amount ($)', '').strip() if 'amount ($)' in row else row.get('amount', '').strip()
-                        if not amount_str:
-                            for key, value in row.items():
-                                if value and value.replace('.', '', 1).isdigit():
-                                    amount_str = value
-                                    break
-                        
-                        amount_str = amount_str.replace('$', '').replace(',', '').strip()
-                        try:
-                            amount = float(amount_str)
-                        except:
-                            amount = 0.0
-                        
-                        description = row.get('description', '')
-                        if not description:
-                            for key, value in row.items():
-                                if value and len(value) > 10 and not value.replace('.', '', 1).isdigit():
-                                    description = value
-                                    break
-                        
-                        transaction = {
-                            'id': row.get('id', ''),
-                            'amount': amount,
-                            'description': description
-                        }
-                        self.transactions.append(transaction)
-            
-            # Load users from CSV format
-            with open('users.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.users = []
-                for row in reader:
-                    user = {
-                        'id': row.get('id', ''),
-                        'name': row.get('name', ''),
-                    }
-                    self.users.append(user)
-                    
-        except FileNotFoundError:
-            self.create_sample_data()
-            self.save_to_csv()
-        except Exception as e:
+        transactions, users = _load_csv_data()
+        if transactions is None or users is None:
+            # Only a missing file gets the sample data; an existing one is kept as loaded
             self.create_sample_data()
+            if transactions is not None:
+                self.transactions = transactions
+            if users is not None:
+                self.users = users
             self.save_to_csv()
+        else:
+            self.transactions, self.users = transactions, users
+    
+    def _index_transactions(self):
+        """Rebuild the per-transaction columns kept aligned with self.transactions"""
+        self._tx_names = self.extract_all_names([t['description'] for t in self.transactions])
+        # Lowercased once here; searches and tokenization both work from it
+        self._tx_desc_lower = [t['description'].lower() for t in self.transactions]
+        self._tx_words = [frozenset(_TOKEN_RE.findall(d)) for d in self._tx_desc_lower]
+        self._tx_kinds = [_tx_keyword(d) for d in self._tx_desc_lower]
+        self._index_tx_postings()
+        self._index_tx_ids()
+        self._amounts_cents = np.array([_to_cents(t['amount']) for t in self.transactions], dtype=np.int64)
+    
+    def _index_tx_ids(self):
+        """Rebuild ID -> slots lookups (the first slot is the first occurrence) and the max numeric ID"""
+        self._tx_by_id = {}
+        self._tx_by_norm_id = {}
+        self._tx_ids_lower = [t['id'].lower() for t in self.transactions]
+        self._max_tx_id = None
+        for slot, (t, tid) in zip(self._tx_slots.tolist(), zip(self.transactions, self._tx_ids_lower)):
+            self._tx_by_id.setdefault(t['id'], []).append(slot)
+            self._tx_by_norm_id.setdefault(tid.strip(), []).append(slot)
+            if t['id'] and t['id'].isdigit():
+                self._max_tx_id = max(self._max_tx_id or 0, int(t['id']))
+    
+    def _index_tx_postings(self):
+        """Rebuild the word -> slots postings and per-slot word counts from self._tx_words"""
+        # Each transaction keeps the slot it gets here (or on add) for life, so a
+        # delete only touches its own postings; _tx_slots maps rows to slots
+        self._tx_slots = np.arange(len(self._tx_words), dtype=np.int64)
+        self._tx_next_slot = len(self._tx_words)
+        self._postings = defaultdict(list)
+        for slot, words in enumerate(self._tx_words):
+            for w in words:
+                self._postings[w].append(slot)
+        self._tx_word_counts = np.array([len(w) for w in self._tx_words], dtype=np.int64)
+    
+    def _append_tx_postings(self, words):
+        """Give a new last transaction a slot and add its words to the postings; returns the slot"""
+        slot = self._tx_next_slot
+        self._tx_next_slot += 1
+        self._tx_slots = np.append(self._tx_slots, slot)
+        for w in words:
+            self._postings[w].append(slot)
+        # Grown by doubling; entries past _tx_next_slot are unused
+        self._tx_word_counts = _grow(self._tx_word_counts, slot + 1)
+        self._tx_word_counts[slot] = len(words)
+        return slot
+    
+    def _tx_row(self, slot):
+        """Current row in self.transactions of the transaction at slot"""
+        return int(np.searchsorted(self._tx_slots, slot))
+    
+    @property
+    def amount_dollars(self):
+        """Transaction amounts in dollars, aligned with self.transactions"""
+        return self._amounts_cents / 100
+    
+    @property
+    def total_amount(self):
+        """Sum of all transaction amounts, cached per data version"""
+        return self._memo(('total_amount',), lambda: int(self._amounts_cents.sum()) / 100)
+    
+    @property
+    def avg_amount(self):
+        """Mean transaction amount (0 when there are none), cached per data version"""
+        return self._memo(('avg_amount',), lambda: (
+            float(self._amounts_cents.mean()) / 100 if len(self._amounts_cents) else 0.0))
+    
+    @property
+    def keyword_counts(self):
+        """Transactions per type keyword (only keywords that occur), cached per data version"""
+        return self._memo(('keyword_counts',), lambda: Counter(filter(None, self._tx_kinds)))
+    
+    @property
+    def avg_name_parts(self):
+        """Mean number of words per non-empty user name, None when there are none"""
+        return self._name_parts_total / self._named_users if self._named_users else None
+    
+    def _extreme_transaction(self, largest):
+        """First transaction with the smallest (or largest) amount, None when empty"""
+        cents = self._amounts_cents
+        if not len(cents):
+            return None
+        # Cents rounding is monotonic, so the exact extreme is among the extreme-cents rows
+        rows = np.flatnonzero(cents == (cents.max() if largest else cents.min()))
+        pick = max if largest else min
+        return pick((self.transactions[i] for i in rows), key=lambda t: t['amount'])
+    
+    @property
+    def min_transaction(self):
+        """Transaction with the smallest amount (first on ties), cached per data version"""
+        return self._memo(('min_transaction',), lambda: self._extreme_transaction(False))
+    
+    @property
+    def max_transaction(self):
+        """Transaction with the largest amount (first on ties), cached per data version"""
+        return self._memo(('max_transaction',), lambda: self._extreme_transaction(True))
+    
+    def _index_users(self):
+        """Rebuild user name signatures, the by-ID slots lookup (first slot is the first occurrence) and the max ID number"""
+        self._user_sigs = [self.name_signature(u.get('name')) for u in self.users]
+        self._user_ids_lower = [u['id'].lower() for u in self.users]
+        self._user_names_lower = [(u.get('name') or '').lower() for u in self.users]
+        # Running totals for the average name-part count
+        self._named_users = sum(1 for u in self.users if u['name'])
+        self._name_parts_total = sum(len(u['name'].split()) for u in self.users if u['name'])
+        self._index_user_bits()
+        self._user_by_id = {}
+        self._max_user_num = None
+        for slot, u in zip(self._user_slots.tolist(), self.users):
+            self._user_by_id.setdefault(u['id'], []).append(slot)
+            if u['id']:
+                # Extract numbers from ID
+                for n in _NUM_RE.findall(u['id']):
+                    self._max_user_num = max(self._max_user_num or 0, int(n))
+    
+    def _index_user_bits(self):
+        """Rebuild the name postings and per-slot char bitsets and name parts from self._user_sigs"""
+        sigs = self._user_sigs
+        # Users keep their slot for life, as transactions do; _user_slots maps rows to slots
+        self._user_slots = np.arange(len(sigs), dtype=np.int64)
+        self._user_next_slot = len(sigs)
+        self._char_vocab = {}
+        self._user_postings = defaultdict(list)
+        char_rows, char_cols = [], []
+        for i, sig in enumerate(sigs):
+            if sig is None:
+                continue
+            for key in self._name_keys(sig):
+                self._user_postings[key].append(i)
+            for c in sig[2]:
+                char_rows.append(i)
+                char_cols.append(self._char_vocab.setdefault(c, len(self._char_vocab)))
+        # The character vocabulary stays small, so these bitsets are a column or two wide
+        self._user_char_bits = _pack_bits(char_rows, char_cols, len(sigs), len(self._char_vocab))
+        self._user_word_counts = np.array([len(s[1]) if s else 0 for s in sigs], dtype=np.int64)
+        self._user_char_counts = np.array([len(s[2]) if s else 0 for s in sigs], dtype=np.int64)
+        self._user_lower = np.array([s[0] if s else '' for s in sigs], dtype=object)
+        self._user_first = np.array([s[3] if s else '' for s in sigs], dtype=object)
+        self._user_last = np.array([s[4] or '' if s else '' for s in sigs], dtype=object)
+    
+    def _append_user_bits(self, sig):
+        """Give a new last user a slot and add its name signature to the postings and per-slot arrays; returns the slot"""
+        slot = self._user_next_slot
+        self._user_next_slot += 1
+        self._user_slots = np.append(self._user_slots, slot)
+        # Grown by doubling; entries past _user_next_slot are unused
+        self._user_char_bits = _grow(self._user_char_bits, slot + 1)
+        self._user_word_counts = _grow(self._user_word_counts, slot + 1)
+        self._user_char_counts = _grow(self._user_char_counts, slot + 1)
+        self._user_lower = _grow(self._user_lower, slot + 1)
+        self._user_first = _grow(self._user_first, slot + 1)
+        self._user_last = _grow(self._user_last, slot + 1)
+        if sig is None:
+            self._user_char_bits[slot] = 0
+            self._user_word_counts[slot] = self._user_char_counts[slot] = 0
+            self._user_lower[slot] = self._user_first[slot] = self._user_last[slot] = ''
+            return slot
+        
+        for key in self._name_keys(sig):
+            self._user_postings[key].append(slot)
+        cols = [self._char_vocab.setdefault(c, len(self._char_vocab)) for c in sig[2]]
+        width = (len(self._char_vocab) + 63) // 64
+        if width > self._user_char_bits.shape[1]:
+            self._user_char_bits = np.pad(self._user_char_bits, ((0, 0), (0, width - self._user_char_bits.shape[1])))
+        self._user_char_bits[slot] = _pack_bits([0] * len(cols), cols, 1, width * 64)[0]
+        self._user_word_counts[slot] = len(sig[1])
+        self._user_char_counts[slot] = len(sig[2])
+        self._user_lower[slot], self._user_first[slot], self._user_last[slot] = sig[0], sig[3], sig[4] or ''
+        return slot
+    
+    @staticmethod
+    def _name_keys(sig):
+        """Posting keys for a name signature.
+        
+        A pair can only reach the 0.3 match cutoff by sharing a word, the
+        last word, the first character (with char similarity >= 2/3), or
+        the whole character set, so sharing one of these keys is necessary.
+        """
+        n, words, chars, first, last = sig
+        keys = [('w', w) for w in words]
+        keys.append(('c', chars))
+        if first:
+            keys.append(('f', first))
+        if last is not None:
+            keys.append(('l', last))
+        return keys
+    
+    def _user_name_candidates(self, sig):
+        """Slots (ascending) of users that could reach the match cutoff against sig"""
+        postings = []
+        for key in self._name_keys(sig):
+            if key not in self._user_postings:
+                continue
+            slots = self._user_postings[key]
+            if key[0] == 'f':
+                # A first-letter-only pair needs char similarity >= 2/3, which
+                # bounds the char-set sizes to within a 2:3 ratio
+                slots = np.asarray(slots, dtype=np.intp)
+                counts = self._user_char_counts[slots]
+                q = len(sig[2])
+                slots = slots[3 * np.minimum(counts, q) >= 2 * np.maximum(counts, q)]
+            postings.append(slots)
+        if not postings:
+            return np.zeros(0, dtype=np.intp)
+        return np.unique(np.concatenate(postings))
+    
+    def _user_name_scores(self, sig, slots):
+        """Name similarity of sig to the users at slots: 0.7 * word Jaccard + 0.3 * char Jaccard, +0.1 same first letter, +0.2 same last word, max 1.0"""
+        # An identical name scores 1.0; a name with no words on either side scores 0.0
+        n, words, chars, first, last = sig
+        # Shared words counted off the word postings, shared characters off the bitsets
+        postings = [self._user_postings[('w', w)] for w in words if ('w', w) in self._user_postings]
+        common_words = (np.bincount(np.concatenate(postings), minlength=self._user_next_slot)[slots]
+                        if postings else np.zeros(len(slots), dtype=np.int64))
+        known = [self._char_vocab[c] for c in chars if c in self._char_vocab]
+        common_chars = _popcount_rows(self._user_char_bits[slots] & _pack_bits(
+            [0] * len(known), known, 1, self._user_char_bits.shape[1] * 64))
+        word_counts = self._user_word_counts[slots]
+        
+        # Rows with a zero denominator are overwritten below
+        all_words = np.maximum(len(words) + word_counts - common_words, 1)
+        all_chars = len(chars) + self._user_char_counts[slots] - common_chars
+        char_similarity = np.where(all_chars > 0, common_chars / np.maximum(all_chars, 1), 0.0)
+        
+        scores = ((common_words / all_words) * 0.7) + (char_similarity * 0.3)
+        if first:
+            scores += np.where(self._user_first[slots] == first, 0.1, 0.0)
+        if last is not None:
+            scores += np.where(self._user_last[slots] == last, 0.2, 0.0)
+        scores = np.minimum(1.0, scores)
+        
+        if not words:
+            scores[:] = 0.0
+        scores[word_counts == 0] = 0.0
+        scores[self._user_lower[slots] == n] = 1.0
+        return scores
     
     def create_sample_data(self):
-        """Create sample data using provided data"""
-        # transactions data
-        self.transactions = [
-            {"id": "caqjJtrI", "amount": 88549.0, "description": "From Liam J. Johnson for Deel, ref 4oJnVOMRLZftACC//403705217843//CNTR"},
-            {"id": "AcwQVVtq", "amount": 95880.0, "description": "From Olivia Roland Smith for Deel, ref mhH2aFLP4rPTACC//460168509379//CNTR"},
-            {"id": "N0wJk7Kp", "amount": 56834.0, "description": "From 杨陈 for Deel, ref 0Ckil9BX0zXMACC//14748849412//CNTR"},
-            {"id": "RAZbbmLX", "amount": 98237.0, "description": "Transfer from Emma Brown for Deel, ref kKx5IWycb93DACC//943167654914//CNTR"},
-            {"id": "bIzmL3pD", "amount": 82977.0, "description": "From Oliver Talor for Deel, ref zMpiWFssuC1sACC//227441521818//CNTR"},
-            {"id": "m1wOOZNz", "amount": 9101.0, "description": "From Ἄλεξις Ava Anderson \ for Deel, ref 05SbIAy2skd RACC//245536464259//CNTR"},
-            {"id": "YPOEKpLs", "amount": 74574.0, "description": "From William Martinez for Deel, ref WTrshixkeu1bACC//674187619769//CNTR"},
-            {"id": "Ysop2Dzq", "amount": 34224.0, "description": "Received from !Isabel Wilson for Deel, ref MBGqLvH42h86ACC//408322552701//CNTR"},
-            {"id": "86OWU7JD", "amount": 69999.0, "description": "From Elijah    Thomas for Deel, ref Ztp4U. cviuBQGACC//464686064210//CNTR"},
-            {"id": "ZdNxnh4E", "amount": 63809.0, "description": "From Sophia Lizzie    Clark for Deel, ref FK824HgoLbQWACC//24332722812//CNTR"},
-            {"id": "o38UQgrd", "amount": 24600.0, "description": "ref KdlU2gNBe4UkACC//262389856139//CNTR From James. Rodríguez for Deel, "},
-            {"id": "J7os8g9d", "amount": 38405.0, "description": "From Mia Lewis, for Deel, ref dAK21Vs4e7vNACC//627987585520//CNTR"},
-            {"id": "kXAGOWZ4", "amount": 40781.0, "description": "From Benjamin Lee Test for Deel, ref 9J6Z8JulDKC6ACC//781831470590//CNTR"},
-            {"id": "rJfl3qKG", "amount": 2168.0, "description": "Request from Charlotte  Grace Walker for Deel, ref eyQXUXo0VetvACC//599309693244//CNTR"},
-            {"id": "KX4Ug0Vd", "amount": 51965.0, "description": "From LucAS Hall for Deel, ref OfyJs95EIEy2ACC//202544590548//CNTR"},
-            {"id": "fpFEF1ur", "amount": 72546.0, "description": "From Amelia Turner for Deel, ref JDtWqKRm8XppACC//354138983151CCElijah//CNTR"},
-            {"id": "GLLh0V6N", "amount": 46418.0, "description": "Transfer from Hen ry Hill for Deel, ref eY3bFzieZ. 6fDACC//29987282543//CNTR"},
-            {"id": "QvW72smG", "amount": 29890.0, "description": "From Harper580Adams for Deel, ref iOOGkNSUx60VACC//702602048415//CNTR"},
-            {"id": "uU2NRqif", "amount": 44812.0, "description": "  From Αλέξανδρος Μπέικερ for Deel, ref 5ZbSrAlOvfqDACC//922906239060//CNTR"},
-            {"id": "ycH8jf7N", "amount": 72697.0, "description": "From Évèlyn Allèn Jr. for Deel, ref cQqQDAA NGtu4AC a'',adsC//426045068062//CNTR"},
-            {"id": "ei6nge4H", "amount": 90425.0, "description": "From Danniel.Wright for Deel, ref 2iWIr1my1oNIACC//826468457411//CNTR"},
-            {"id": "jUuibOk8", "amount": 94298.0, "description": "Payment from אֲבִיגַיִל גרין for Deel, ref mBEG9W1jyIj. zACC//252746919478//CNTR"},
-            {"id": "772Y58MU", "amount": 21265.0, "description": "From Matthe';w Ki|ng for Deel, ref QikIUvnJPdY8ACC//228449538371//CNTR"},
-            {"id": "aglz0x27", "amount": 14591.0, "description": "Payment from Sophia   Cork for Deel, ref dYHRq84OWic3 ACC//596726975562//C NTR"},
-            {"id": "YQpsruWK", "amount": 16552.0, "description": "From Michael 60413 Moore for Deel, ref E47q70bJeQAHACC//383849066552//CNTR"},
-            {"id": "iLZfczUk", "amount": 3650.0, "description": "Transfer from Elizabeth Nora Mitchell for Deel, ref XsSovxGcE 7yjACC//202297416135//CNTR"},
-            {"id": "l8cn5kW7", "amount": 59155.0, "description": "From Jackson for Deel, ref 7eWbcoTyndmdA0,';CC//Nelson662373120171//CNTR"},
-            {"id": "bQTK9h5F", "amount": 90940.0, "description": "From   Deel, ref 6o5rMIf23tCLACC//30434. 8221268//CNTR, ref Campbell"},
-            {"id": "cJxua5um", "amount": 94177.0, "description": "From Davd # Carter 94177 for Deel, ref 0aQSpCwopTr 0ACC//50280867206//CNTR"},
-            {"id": "JkJnn0kt", "amount": 94599.0, "description": "Transfer from 陈剑 for Deel, ref kcg2uswXSae6ACC//270685055935//CNTR, CN"},
-            {"id": "BWIigGOK", "amount": 14574.0, "description": "From Joseph Elijah evans for Deel, ref Th1GFHihTX7IACC//674072611669//CNTR"},
-            {"id": "mYMQcqtN", "amount": 8252.0, "description": "From Grace COLLINS for Deel, ref ZsE7FSQMJWRZACC//26420273995//CNTR cc Grace"},
-            {"id": "Oz12uLqw", "amount": 11517.0, "description": "From Samuel Ewards, ref xY40fJaHfl0pACC//947117080077//CNTR"},
-            {"id": "zKzUOlWx", "amount": 79653.0, "description": "From Benjamin Leedsfor Deel, ref n7RgpOBeok6MACC//607317210539//CNTR"},
-            {"id": "62O2d9rm", "amount": 60540.0, "description": "Payment from Benjamin Rivera for Deel, ref M0VYem35 # jp80ACC//245929755733//CNTR"},
-            {"id": "iMsNYIes", "amount": 27084.0, "description": "From Lily Kelly01 for Deel, ref R61iD7yMOvhLACC//916452734626//CNTR ref Stripe"},
-            {"id": "pXAMd74U", "amount": 53576.0, "description": "From for Deel, ref KFRJKAQf3UmwACC//451  230593191//CNTR ref: Jack Cooper"},
-            {"id": "1L7kkXTk", "amount": 33134.0, "description": "From 刘王 for Deel, ref iBxqUQgWCQ5xACC//532800242260//CNTR"},
-            {"id": "Tn3ParZH", "amount": 27893.0, "description": "From Andrew Richar dson for Deel, ref 3w8t3Cm oKtxHACC//45357314666//CNTR"},
-            {"id": "hme4Sohp", "amount": 80990.0, "description": "From Aria Cox for Deel, ref 1XZd   lO0bUAEkACC//722923598131//CNTR"},
-            {"id": "kV6qdhZ2", "amount": 83112.0, "description": "To Deel Limited CREDIT REF From Christopher ERR# Ward for Deel, ref lc5CPGXlCbfV ACC//2 3569501332//CNTR"},
-            {"id": "mkcUo5Z7", "amount": 52776.0, "description": "Payment from Scarlettross for Deel, ref 3XcqgSiFCLl7ACC//158226484940//CNTR"},
-            {"id": "1NfQ59pg", "amount": 97070.0, "description": "From William hillips for Deel, debit ref DIXtzQm5IO0zACC//324137134388//CNTR"},
-            {"id": "vUl27SqF", "amount": 49811.0, "description": "From zoeyhowardfor Deel, ref 5azQbS8RncclACC//229632809211//CNTR"},
-            {"id": "LToaYEdv", "amount": 40796.0, "description": "  From J for Deel, ref 1pg8kFxI85TxACC//838904646618//CNTR, Foster"},
-            {"id": "xgDlc1vd", "amount": 91610.0, "description": "From Refley Hayes for Deel, ref mWJ5iNM R6TW1ACC//343604403820//CNTR"},
-            {"id": "K0PvnhYL", "amount": 40952.0, "description": "From Daniel Torres   Smith for Deel, ref 0R5pzL0z2274ACC//844239942124//CNTR"},
-            {"id": "H206KrAe", "amount": 2618.0, "description": "From Penelope Campbell for Deel, ref B1Dmdkg   ZQaghAC. C//997618212692//CNTR"},
-            {"id": "WfBC5iDR", "amount": 64857.0, "description": "From Richard COLEman for Deel, ref j7iLqKLaAcUHACC//580965106098//CNTR"},
-            {"id": "iA9W3i4p", "amount": 13016.0, "description": "Payment from Layla JJ Simmons for Deel, ref MSiATnIekZ8FACC//530393227103//CNTR"},
-            {"id": "po2g9Xm7", "amount": 11.0, "description": "Deel payment from Isabella Wilson for Deel, ref f5y6MQuBoDC7ACC//.  522175259477//CNTR Test 2"},
-            {"id": "nbu7y4bD", "amount": 33358.0, "description": "From Στέλλα Σάντερς or Deel, ref 9w8klaP6jIXbACC//695030250684//CNTR"},
-            {"id": "FIWdSeXw", "amount": 45304.0, "description": "From Joshua Ross for Deel, ref TIAx1Dd 0GqPf ACC//7368 50308280//CNTR"},
-            {"id": "bjlYu7Bu", "amount": 24686.0, "description": "From AURORA  POWELL for Deel, ref jk5MU6rT0PipACC//426818621925//CNTR"},
-            {"id": "X8TL4dMU", "amount": 482.0, "description": "From Jonathan ,ERR#   perry for Deel, ref HOho3u6fCfA  LACC//1536 84403399//CNTR"},
-            {"id": "khe7Al8M", "amount": 97047.0, "description": "From Ellie L0NG for Deel, ref 91be6IO1bT9LACC//117271000422//CNTR"},
-            {"id": "lNsyXbbm", "amount": 49227.0, "description": "From Matthewbrooks for Deel, ref V4tS94LUIhnn ACC//133241906791//CNTR"},
-            {"id": "YdnIEv4P", "amount": 24893.0, "description": "ref ToCu6iXjX7jMACC//307338080372//CNTR From Hannah Wood for Deel, "},
-            {"id": "RGddTMKb", "amount": 72231.0, "description": "From for Deel, ref brclUxkgDQxGACC//  82366915272//CNTR, ref: Samuel Washington "},
-            {"id": "kWedRMMj", "amount": 32169.0, "description": "From Hàzèl Fòstèr for Deel, ref IIiBgauTFe2WACC//192898280394//CNTR"},
-            {"id": "Ev3RE1ZN", "amount": 53804.0, "description": "Payment from Christopher Morgan for Deel, ref aW7sNT8XG5HEACC//881041028266//CNTR"},
-            {"id": "1yiHP6j1", "amount": 70901.0, "description": "From Victoria Fisher for Deel, ref WFzjfQGdZBOWACC//243572413934//CNTR"},
-            {"id": "LLNtaY1E", "amount": 31925.0, "description": "Transfer from andrew   barnes for deel, ref CIUzXGzZKjXCACC//96665 0170774//CNTR"},
-            {"id": "8CMYRRuJ", "amount": 43452.0, "description": "To Deel, From BeLLA Bennett, Debit for Deel, ref FyVQuiRcC6WOACC//822225184231//CNTR"},
-            {"id": "TcK8tATA", "amount": 36079.0, "description": "From David Matthew Hughes for Deel, ref fLMhfb3cblKAACC//601540098907//CNTR"},
-            {"id": "TYEUeTqp", "amount": 68228.0, "description": "From Luna LoveReed for Deel, ref NT83w6IxGAA6ACC//245553792376//CNTR"},
-            {"id": "QDjbEktD", "amount": 83311.0, "description": "  From GAbriel C for Deel, ref O7vhDWwuF9HwACC//414484851241//CNTR"},
-            {"id": "I8WIeHQ2", "amount": 51683.0, "description": "From Mila K Ward for Deel, ref NA2YDcPJiF47A CC//111019096907//CNTR"},
-            {"id": "pzXPtaQX", "amount": 50180.0, "description": "From Christopher Gonzal ez 0912 for Deel, ref kzXlB64from Deelvxp4cACC// 136326279819//CNTR"},
-            {"id": "ukegCBQf", "amount": 58019.0, "description": "Received from Paisley Taylor for Deel, ref ksIVpU1sRNWsACC//374252501136//CNTR"},
-            {"id": "WnU1N3KB", "amount": 9790.0, "description": "From or Deel, ref rw6j3KyBDwN7ACC// John Mitchell 77152073245//CNTR"},
-            {"id": "D5aW2I5o", "amount": 7118.0, "description": "From James Bennett. for Deel, ref mRwqP1U katxJACC//83 6081329508//CNTR"},
-            {"id": "hqLc27Y0", "amount": 5304.0, "description": "Transfer from Elii, Morris for Deel, ref QtCi92cN8G4uACC//610134600789//CNTR"},
-            {"id": "AXLbpmng", "amount": 18640.0, "description": "From Natalie 4Reed for Deel, ref PjwTiDQiNmSxACC//274051933698//CNTR"},
-            {"id": "ubfjurUH", "amount": 41553.0, "description": "Payment from Isaac Bell for Deel, ref wNRgWW35i2lSACC//196752583852//CNTR"},
-            {"id": "UTtagNiO", "amount": 14313.0, "description": "Transfer from Savannah, Cox for Deel, ref yusBURo0rWCTACC//Wise270331093380//CNTR"},
-            {"id": "n9TP2eyH", "amount": 73957.0, "description": "From Samuel Cooper for Deel, ref 78jt3NUhNqb0ACC//234687750024//CNTR"},
-            {"id": "Pve1P1JG", "amount": 7471.0, "description": "From Claire.   Simmons for Deel, ref nSQnjQTpx11hACC//852986891535//CNTR"},
-            {"id": "pSSoQLp1", "amount": 65498.0, "description": "From Henry for Deel, ref chKWkdineb8KACC//377565502403//CNTR cc Gray"},
-            {"id": "mzF8d1xj", "amount": 75846.0, "description": "ref ntTQWJzFuTUcACC//418585662634//CNTR, From Nora Robérts for Deel"},
-            {"id": "MKQBCtHk", "amount": 12799.0, "description": "From 李周 for Deel, ref b1e0C1D9L8UBACC//18540590190//CNTR"},
-            {"id": "Dh4v16ya", "amount": 25945.0, "description": "From Leah Phillips   for Deel, ref 4Nl53fQgzTLW  ACC//139343615978//CNTR"},
-            {"id": "FvlVMfTK", "amount": 77075.0, "description": "Received from Christian Ridley Scott for Deel, ref 3IF2b0AC palNACC//135548234898//CNTR"},
-            {"id": "HA7WvqW8", "amount": 11629.0, "description": "From Skylarrichardson for Deel, ref 7kyzcadBHmcPACC//312395299071//CNTR"},
-            {"id": "NeK3bkCl", "amount": 7754.0, "description": "From Daniel Rivera for Deel, ref eMIPKJK8o96oACC//6991339   43862//CNTR"},
-            {"id": "guxUF6y3", "amount": 91642.0, "description": "From Audrey Watson for Deel, ref yOt958gn  x5ihACC//993136471955//CNTR"},
-            {"id": "JL0D4qb8", "amount": 71015.0, "description": "From Matthew RogersWest for Deel, ref 41FhWzvdPr0wACC//786114371221//CNTR"},
-            {"id": "QHT6WjtE", "amount": 92402.0, "description": "ref 41FhWzvdPr0wACC//781928311221//CNTR"},
-            {"id": "cbkyilio", "amount": 76097.0, "description": "To Deel From Ανδρέας Ροντέελ for Deel, ref JWpKX08r58TFACC//320031128372//CNTR"},
-            {"id": "z9sxWMp1", "amount": 76933.0, "description": "From Addison, Hughes for Deel, ref 3QJqWKnphs7gACC//576214218838//CNTR"},
-            {"id": "dkNXQFOr", "amount": 6571.0, "description": "From David . Wood for Deel, ref 71TzDTannTpqACC//912938527393//CNTR, CC Isabella P Wilson"},
-            {"id": "OuFHALqM", "amount": 3773.0, "description": " ref 3Klmiksre3kcACC//824788665387//CNTR, from Lily, Foster for Deel,"},
-            {"id": "Flmxgl6m", "amount": 53048.0, "description": "From James K Coleman for Deel, ref 5f2Lv5I4F6I0ACC//786232316420//CNTR"},
-            {"id": "kAHSbQVZ", "amount": 41438.0, "description": "Payment from   Coleman Elliefor Deel, ref xA6yX5UBYJDIACC//70625  4192680//CNTR"},
-            {"id": "73or0URj", "amount": 68213.0, "description": "From ERR# Ryan Diaz for Deel, ref VN5wa5wfSbbtACC//447264510603//CNTR"},
-            {"id": "SxybKXAR", "amount": 75557.0, "description": "From Audrey Peterson for Deel, ref UWSpnVhFXGHsACC//591757440683//CNTR"},
-            {"id": "Q70YUP0y", "amount": 25949.0, "description": "Transfer from  奕辰 for Deel, ref 7bQYUZ1Bble5ACC//852295144198//CNTR"},
-            {"id": "9BXRliwT", "amount": 88333.0, "description": "From Elena## BUTLET for Deel, ref oheOEVx,wfB1XACC//169992916947//CNTR"},
-            {"id": "5iXzRftq", "amount": 54600.0, "description": "From Christian Griffin for Deel, ref NAJRqF8WtAndACC//808417184144//CNTR"},
-            {"id": "D3k1gB6S", "amount": 76571.0, "description": "From Grace Henderson for Deel, ref odjYain0Nn65ACC//623238516454//CNTR"}
-        ]
-        
-        # users data
-        self.users = [
-            {"id": "0SIPZjNuoc", "name": "David Wood"},
-            {"id": "2xmcoVivzb", "name": "Sophia Cork"},
-            {"id": "4qkOzbyv8T", "name": "Chris Gonzalez"},
-            {"id": "55Gm68Ccwt", "name": "Evelyn Allen"},
-            {"id": "5V675CF26e", "name": "Alexis Anderson"},
-            {"id": "5WNEypC0m3", "name": "Benjamin Leeds"},
-            {"id": "6EMyCbDRkP", "name": "Stella Sanders"},
-            {"id": "6fc89iJwho", "name": "Isaac Bell Deel"},
-            {"id": "6qpOLRLwjT", "name": "Sophia Elizabeth Clark"},
-            {"id": "79vkUflfMg", "name": "John Ryan Diaz"},
-            {"id": "79xW1adz5g", "name": "Jian Chen"},
-            {"id": "7q68zSaFTx", "name": "Sam Cooper"},
-            {"id": "7wgTardvTI", "name": "Penelop Campbell"},
-            {"id": "7xElNaaCQk", "name": "Liu Wang"},
-            {"id": "8aq20vZEdJ", "name": "Jack Cooper"},
-            {"id": "8Habsd7CTg", "name": "Elena"},
-            {"id": "8rb7GnSzJk", "name": "Audrey Eleanor Peterson"},
-            {"id": "8ux42Wpbip", "name": "Savannah Cox"},
-            {"id": "AMll2cfBB3", "name": "Aria J Cox"},
-            {"id": "biQokkjAng", "name": "Sam Edwards"},
-            {"id": "bqrLHl0t2x", "name": "Elizabeth Mitchell"},
-            {"id": "BuCoIvL79A", "name": "Emma Brown"},
-            {"id": "CphJKL9Xdi", "name": "Oliver Taylor"},
-            {"id": "crHOEW9iLZ", "name": "Audrey  "},
-            {"id": "cvsmvo6HvW", "name": "Jackson Nelson"},
-            {"id": "dLq0apeuqQ", "name": "Sophia Campbell"},
-            {"id": "DMExRDkob0", "name": "Lily Foster"},
-            {"id": "EaZFAk1T5c", "name": "Benjamin Lee"},
-            {"id": "FhRDVhmleA", "name": "Daniel Deel"},
-            {"id": "FHyv02SXtt", "name": "Daniel Wright"},
-            {"id": "Fmq8FMWLvG", "name": "Mila Ward"},
-            {"id": "FOaJDAtIsk", "name": "Gabriel Cooper"},
-            {"id": "hEXLwnpXdz", "name": "Nora Roberts"},
-            {"id": "Hl7n5MGoJo", "name": "Andrew Rodeel"},
-            {"id": "HPkVoiDiMh", "name": "Harper Adams"},
-            {"id": "HuSxJ0Xpw5", "name": "John Mitchell"},
-            {"id": "i52RbjL6om", "name": "AuroraPowell", },
-            {"id": "IGGyBnhJMc", "name": "Nathalie Claire Reed"},
-            {"id": "IlCknvAtTl", "name": "Matthew King"},
-            {"id": "IYkWtGZXLe", "name": "Matthew Brookers"},
-            {"id": "IzXzXqM6Kd", "name": "William Phillips"},
-            {"id": "J2a9tmnIgt", "name": "Andrew Barnes"},
-            {"id": "JaLd6Pqhpr", "name": "Henry Hill"},
-            {"id": "Jco6EIdzNx", "name": "Ellie Colman"},
-            {"id": "jGcUAiKPn2", "name": "David Carter"},
-            {"id": "JhAc0o2nWx", "name": "Christian Ridley Scott"},
-            {"id": "K0yjPXISO6", "name": "William James Martinez"},
-            {"id": "Kb1GVgxraJ", "name": "Hazel Foster"},
-            {"id": "kelsFH8kye", "name": "Yichen"},
-            {"id": "kL1f4iVK0i", "name": "Li Zhou"},
-            {"id": "lIO4js3kkx", "name": "James L Coleman"},
-            {"id": "LpQg45AveB", "name": "Grace Collins"},
-            {"id": "lVGwIjbyuF", "name": "Grace H"},
-            {"id": "lYkiV5XrpZ", "name": "Rick Coleman"},
-            {"id": "McA5Obtn0B", "name": "Layla Simmons"},
-            {"id": "NG9mBbhEWZ", "name": "Avigail Green"},
-            {"id": "nHDyCE2JUS", "name": "Skylar Richardson"},
-            {"id": "nZMQ1GyJ2N", "name": "Yang Chen"},
-            {"id": "OTMJ5TCHKM", "name": "Samuel Washington"},
-            {"id": "owAZX0Uiq4", "name": "Amelia Turner"},
-            {"id": "P6bIUUtNdd", "name": "Henry Gray"},
-            {"id": "pdVS8wvwjA", "name": "Paisley Taylor"},
-            {"id": "pHRIGzvS2p", "name": "Joseph Evans"},
-            {"id": "PYbDvqF2gL", "name": "Eli Morris"},
-            {"id": "PZ5gUNWL7O", "name": "Luna Reed"},
-            {"id": "qBCElYF454", "name": "Andrw Richardson"},
-            {"id": "QP6hL6v0oF", "name": "Matthew West"},
-            {"id": "r2ZDOIfIIP", "name": "Scarlett Ross"},
-            {"id": "ri78o203V0", "name": ""},
-            {"id": "rqUvaPdEyD", "name": "Refley Hayes"},
-            {"id": "S9rhnsCPxy", "name": "Lea Phillips"},
-            {"id": "SB1zc80PFp", "name": "Olivia North Smith"},
-            {"id": "ToAD2rzvGA", "name": "Isabella Wilson"},
-            {"id": "TRBJYTbOHR", "name": "Christopher Ward Morgan"},
-            {"id": "U4NNQUQIeE", "name": "Liam Johnson"},
-            {"id": "U4Pps5wQzx", "name": "Addison James Hughes"},
-            {"id": "u8yJD9cFLB", "name": "Joseph Foster"},
-            {"id": "UmmrJMw1go", "name": "Daniel Torres"},
-            {"id": "UmTNYD8XrY", "name": "Zoey Howard"},
-            {"id": "uRCvdelpFs", "name": "Hannah Woods"},
-            {"id": "V86OZUmxdr", "name": "Jonathan Perry"},
-            {"id": "VfY9DmIkiL", "name": "Isabella Wilson"},
-            {"id": "vPYeL2gRtJ", "name": "Charlotte Walker"},
-            {"id": "VTkSTucYgz", "name": "David Hughes"},
-            {"id": "w9eCGb5eot", "name": "Fisher Victoria"},
-            {"id": "WfNEYEo6vu", "name": "Michael Moore"},
-            {"id": "WH2fpHdEDk", "name": "Claire Simmons"},
-            {"id": "woUGau09yc", "name": "Benjamin Rivera"},
-            {"id": "wvbZFCcalJ", "name": "Lucas Hall"},
-            {"id": "XSwFsQlyYa", "name": "James Bennett"},
-            {"id": "xuLP9ZRIlC", "name": "Alexander Baker"},
-            {"id": "XUMMkD3fvH", "name": "James Rodriguez"},
-            {"id": "YAKhwLcHLA", "name": "Ellie Long"},
-            {"id": "yDhnGNLelf", "name": "Ma Lewis"},
-            {"id": "YEYnQomP3u", "name": "Elijah Thomas"},
-            {"id": "yiVnc6cMMB", "name": "Griffin Christian"},
-            {"id": "Yt4Ppnjbpw", "name": "Christopher Ward"},
-            {"id": "Z5Zh6jVQaB", "name": "Lily Kelly"},
-            {"id": "ZjCI84CW6U", "name": "Bella Bennett"},
-            {"id": "Zq05LEibbQ", "name": "Ross Joshua"},
-            {"id": "Qg12EWasd", "name": "Μarιa Perikleous"}
-        ]
+        """Create sample data from the bundled sample_data.json"""
+        with open(os.path.join(_APP_DIR, 'sample_data.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.transactions = data['transactions']
+        self.users = data['users']
     
     def save_to_csv(self):
         """Save data to CSV files"""
         # Save transactions
-        with open('transactions.csv', 'w', newline='', encoding='utf-8') as f:
-            f.write("id,amount ($),description\n")
-            for t in self.transactions:
-                desc = t['description'].replace('"', '""')
-                if ',' in desc or '"' in desc:
-                    desc = f'"{desc}"'
-                f.write(f"{t['id']},{t['amount']},{desc}\n")
+        with open('transactions.csv', 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+            writer.writerow(_TX_CSV_HEADER)
+            writer.writerows((t['id'], _to_cents(t['amount']) / 100, t['description']) for t in self.transactions)
         
         # Save users
-        with open('users.csv', 'w', newline='', encoding='utf-8') as f:
-            f.write("id,name\n")
-            for u in self.users:
-                f.write(f"{u['id']},{u['name']}\n")
+        with open('users.csv', 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+            writer.writerow(_USER_CSV_HEADER)
+            writer.writerows((u['id'], u['name']) for u in self.users)
+        
+        # Files changed on disk, drop the cached parse
+        _load_csv_data.clear()
     
-    def extract_name_from_text(self, text):
-        """Extract name from text - enhanced for your data format"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def extract_name_from_text(text):
+        """Extract name from text - enhanced for your data format (memoized per description)"""
         if not text:
             return ""
         
-        text = text.replace('  ', ' ').replace('   ', ' ').strip()
-        
-        patterns = [
-            r'From\s+([^,]+?)\s+for\s+Deel',
-            r'from\s+([^,]+?)\s+for\s+Deel',
-            r'Transfer from\s+([^,]+?)\s+for\s+Deel',
-            r'Payment from\s+([^,]+?)\s+for\s+Deel',
-            r'Received from\s+([^,]+?)\s+for\s+Deel',
-            r'Request from\s+([^,]+?)\s+for\s+Deel',
-            r'To Deel.*From\s+([^,]+?)\s+for\s+Deel',
-            r'Deel payment from\s+([^,]+?)\s+for\s+Deel',
-            r'From\s+([^,]+?)\s+,\s+for\s+Deel',
-            r'From\s+([^,]+?)\s+,\s+ref.*for\s+Deel',
-            r'From\s+([^,]+?)\s+ref.*for\s+Deel',
-            r'ref.*From\s+([^,]+?)\s+for\s+Deel'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        text = _COLLAPSE_WS.sub(' ', text).strip()
+        
+        for pattern in _EXTRACT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 name = match.group(1).strip()
-                name = re.sub(r'[^\w\s\.\-]', ' ', name)
-                name = re.sub(r'\s+', ' ', name).strip()
+                name = _CLEAN_NONWORD.sub(' ', name)
+                name = _COLLAPSE_WS.sub(' ', name).strip()
                 
-                name = re.sub(r'\s+\d+$', '', name)
-                name = re.sub(r'\s+(jr|sr|ii|iii|iv|test|debit|credit|err#)$', '', name, flags=re.IGNORECASE)
+                name = _TRAIL_DIGITS.sub('', name)
+                name = _TRAIL_SUFFIX.sub('', name)
                 
                 words = name.split()
                 if len(words) >= 2:
@@ -470,13 +552,8 @@ class DeelTransactionSystem:
                 else:
                     return name
         
-        name_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)',
-        ]
-        
-        for pattern in name_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in _NAME_PATTERNS:
+            matches = pattern.findall(text)
             if matches:
                 for match in matches:
                     if len(match.split()) >= 2 and len(match) > 5:
@@ -484,58 +561,69 @@ class DeelTransactionSystem:
         
         return ""
     
-    def calculate_name_similarity(self, name1, name2):
-        """Calculate similarity between two names"""
-        if not name1 or not name2:
-            return 0.0
-        
-        n1 = name1.lower().strip()
-        n2 = name2.lower().strip()
-        
-        if n1 == n2:
-            return 1.0
-        
-        words1 = set(re.findall(r'[a-z]+', n1))
-        words2 = set(re.findall(r'[a-z]+', n2))
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        common_words = words1.intersection(words2)
-        all_words = words1.union(words2)
-        word_similarity = len(common_words) / len(all_words) if all_words else 0.0
-        
-        chars1 = set(n1.replace(' ', ''))
-        chars2 = set(n2.replace(' ', ''))
-        common_chars = chars1.intersection(chars2)
-        all_chars = chars1.union(chars2)
-        char_similarity = len(common_chars) / len(all_chars) if all_chars else 0.0
-        
-        score = (word_similarity * 0.7) + (char_similarity * 0.3)
-        
-        if n1 and n2 and n1[0] == n2[0]:
-            score += 0.1
-        
-        if ' ' in n1 and ' ' in n2:
-            last1 = n1.split()[-1]
-            last2 = n2.split()[-1]
-            if last1 == last2:
-                score += 0.2
-        
-        return min(1.0, score)
+    def extract_all_names(self, descriptions):
+        """Extract names from many descriptions in one vectorized pass"""
+        if not descriptions:
+            return []
+        
+        text = pd.Series(descriptions, dtype=object).fillna('').astype(str)
+        text = text.str.replace(_COLLAPSE_WS, ' ', regex=True).str.strip()
+        
+        names = text.str.extract(_MASTER_EXTRACT, expand=False)
+        matched = names.notna()
+        
+        cleaned = names[matched].str.strip()
+        cleaned = cleaned.str.replace(_CLEAN_NONWORD, ' ', regex=True)
+        cleaned = cleaned.str.replace(_COLLAPSE_WS, ' ', regex=True).str.strip()
+        cleaned = cleaned.str.replace(_TRAIL_DIGITS, '', regex=True)
+        cleaned = cleaned.str.replace(_TRAIL_SUFFIX, '', regex=True)
+        cleaned = cleaned.str.replace(_FIRST_LAST, r'\1 \2', regex=True)
+        
+        # Descriptions the leading patterns miss go through the full per-row fallback chain
+        result = cleaned.reindex(text.index)
+        for i in result.index[~matched]:
+            result[i] = self.extract_name_from_text(descriptions[i])
+        
+        return result.tolist()
+    
+    @staticmethod
+    def name_signature(name):
+        """Precompute the parts of a name that _user_name_scores compares"""
+        if not name:
+            return None
+        n = name.lower().strip()
+        last = n.split()[-1] if ' ' in n else None
+        return (n, frozenset(_WORD_RE.findall(n)), frozenset(n.replace(' ', '')), n[:1], last)
+    
+    def _memo(self, key, compute):
+        """Return compute() memoized under key for the current data version (LRU)"""
+        with self._lock:
+            key = (self._data_version,) + key
+            if key in self._query_cache:
+                self._query_cache.move_to_end(key)
+                return self._query_cache[key]
+            value = self._query_cache[key] = compute()
+            if len(self._query_cache) > _QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+            return value
     
     def find_user_matches_for_transaction(self, transaction_input):
         """Find matching users for a transaction"""
+        return self._memo(('matches', transaction_input),
+                          lambda: self._find_user_matches(transaction_input))
+    
+    def _find_user_matches(self, transaction_input):
+        """Uncached find_user_matches_for_transaction"""
         try:
             transaction = None
-            for t in self.transactions:
-                if str(t['id']).strip().lower() == str(transaction_input).strip().lower():
-                    transaction = t
-                    break
+            slots = self._tx_by_norm_id.get(str(transaction_input).strip().lower())
+            if slots:
+                i = self._tx_row(slots[0])
+                transaction = self.transactions[i]
             
             if transaction:
                 description = transaction['description']
-                extracted_name = self.extract_name_from_text(description)
+                extracted_name = self._tx_names[i]
             else:
                 description = transaction_input
                 extracted_name = self.extract_name_from_text(description)
@@ -549,19 +637,20 @@ class DeelTransactionSystem:
         if not extracted_name:
             return [], "No name could be extracted from description", transaction
         
+        # Score only the users sharing a posting key with the extracted name
+        sig = self.name_signature(extracted_name)
+        slots = self._user_name_candidates(sig)
+        scores = self._user_name_scores(sig, slots)
         matches = []
-        for user in self.users:
-            if not user.get('name'):
-                continue
-                
-            similarity = self.calculate_name_similarity(extracted_name, user['name'])
-            
-            if similarity >= 0.3:
-                matches.append({
-                    'id': user['id'],
-                    'name': user['name'],
-                    'match_metric': round(similarity, 3)
-                })
+        # Slots ascend with rows, so matches keep the users' order before sorting
+        rows = np.searchsorted(self._user_slots, slots[scores >= 0.3])
+        for i, score in zip(rows, scores[scores >= 0.3]):
+            user = self.users[i]
+            matches.append({
+                'id': user['id'],
+                'name': user['name'],
+                'match_metric': round(float(score), 3)
+            })
         
         matches.sort(key=lambda x: x['match_metric'], reverse=True)
         return matches, extracted_name, transaction
@@ -571,78 +660,119 @@ class DeelTransactionSystem:
         if not query_text:
             return [], 0
         
-        tokens = re.findall(r'\b\w+\b', query_text.lower())
+        # Tokens (and so results) depend only on the lowercased query
+        return self._memo(('similar', query_text.lower(), threshold, top_k),
+                          lambda: self._find_similar_transactions(query_text, threshold, top_k))
+    
+    def _find_similar_transactions(self, query_text, threshold, top_k):
+        """Uncached find_similar_transactions"""
+        tokens = _TOKEN_RE.findall(query_text.lower())
         token_count = len(tokens)
         
         if token_count == 0:
             return [], 0
         
         query_words = set(tokens)
-        results = []
         
-        for t in self.transactions:
-            desc_tokens = re.findall(r'\b\w+\b', t['description'].lower())
-            desc_words = set(desc_tokens)
-            
-            if query_words and desc_words:
-                common_words = query_words.intersection(desc_words)
-                all_words = query_words.union(desc_words)
-                similarity = len(common_words) / len(all_words) if all_words else 0.0
-            else:
-                similarity = 0.0
-            
-            if similarity >= threshold:
-                embedding = []
-                for word in list(query_words)[:10]:
-                    embedding.append(1 if word in common_words else 0)
-                
-                while len(embedding) < 10:
-                    embedding.append(0)
-                
-                results.append({
-                    'id': t['id'],
-                    'description': t['description'],
-                    'amount': t['amount'],
-                    'embedding': embedding[:10],
-                    '_similarity': similarity
-                })
-        
-        results.sort(key=lambda x: x['_similarity'], reverse=True)
-        results = results[:top_k]
-        
-        for r in results:
-            del r['_similarity']
+        known = [w for w in query_words if w in self._postings]
+        if threshold > 0 and not known:
+            return [], token_count
+        
+        # Intersection sizes for every transaction at once, counted off the postings;
+        # query words outside the vocabulary can't intersect but still count in the union
+        inter = (np.bincount(np.concatenate([self._postings[w] for w in known]), minlength=self._tx_next_slot)
+                 if known else np.zeros(self._tx_next_slot, dtype=np.int64))
+        # Only transactions sharing a word with the query can score above zero;
+        # slots ascend with rows, so candidates stay in row order
+        if threshold > 0:
+            slots = np.flatnonzero(inter)
+            rows = np.searchsorted(self._tx_slots, slots)
+        else:
+            slots = self._tx_slots
+            rows = np.arange(len(slots))
+        inter = inter[slots]
+        sims = inter / (len(query_words) + self._tx_word_counts[slots] - inter)
+        
+        keep = np.flatnonzero(sims >= threshold)
+        if len(keep) > top_k:
+            # Partial select down to the top_k-th score (ties kept), then order just those
+            kth = np.partition(sims[keep], -top_k)[-top_k]
+            keep = keep[sims[keep] >= kth]
+        hits = rows[keep[np.argsort(-sims[keep], kind='stable')][:top_k]]
+        
+        # Embedding slots are the first ten query words, zero-padded; a slot is
+        # set when the description contains that word
+        slots = list(query_words)[:10]
+        padding = [0] * (10 - len(slots))
+        results = []
+        for i in hits:
+            t = self.transactions[i]
+            desc_words = self._tx_words[i]
+            results.append({
+                'id': t['id'],
+                'description': t['description'],
+                'amount': t['amount'],
+                'embedding': [1 if word in desc_words else 0 for word in slots] + padding
+            })
         
         return results, token_count
     
+    def search_transactions(self, term, match_id=False, limit=None):
+        """Transactions whose description (or, with match_id, ID) contains term, ignoring case; at most limit"""
+        term = term.lower()
+        return self._memo(('search_transactions', term, match_id, limit), lambda: list(islice((
+            t for t, tid, desc in zip(self.transactions, self._tx_ids_lower, self._tx_desc_lower)
+            if (match_id and term in tid) or term in desc
+        ), limit)))
+    
+    def transactions_frame(self, term=''):
+        """DataFrame of all transactions, or of search_transactions(term) when term is given"""
+        return self._memo(('transactions_frame', term.lower()), lambda: pd.DataFrame.from_records(
+            self.search_transactions(term) if term else self.transactions,
+            columns=['id', 'amount', 'description']))
+    
+    def search_users(self, term, match_id=False):
+        """Users whose name (or, with match_id, ID) contains term, ignoring case"""
+        term = term.lower()
+        return self._memo(('search_users', term, match_id), lambda: [
+            u for u, uid, name in zip(self.users, self._user_ids_lower, self._user_names_lower)
+            if (match_id and term in uid) or term in name
+        ])
+    
+    @_synchronized
     def add_new_transaction(self, amount, description):
         """Add a new transaction"""
-        # Get all numeric IDs
-        numeric_ids = []
-        for t in self.transactions:
-            if t['id'] and t['id'].isdigit():
-                numeric_ids.append(int(t['id']))
-        
-        # Generate new ID
-        if numeric_ids:
-            new_id = str(max(numeric_ids) + 1)
+        # Generate new ID from the highest numeric ID
+        if self._max_tx_id is not None:
+            new_id = str(self._max_tx_id + 1)
         else:
             new_id = "1001"
         
+        # Rounded to cents, as the CSV and the totals store it
+        cents = _to_cents(amount)
         new_transaction = {
             'id': new_id,
-            'amount': float(amount),
+            'amount': cents / 100,
             'description': description
         }
         
         # Add to transactions list
         self.transactions.append(new_transaction)
-        # Save to CSV
-        self.save_to_csv()
-        
-        # Update session state
-        if 'system' in st.session_state:
-            st.session_state.system.transactions = self.transactions
+        self._data_version += 1
+        self._max_tx_id = int(new_id)
+        self._tx_names.append(self.extract_name_from_text(description))
+        self._tx_ids_lower.append(new_id.lower())
+        self._tx_desc_lower.append(description.lower())
+        self._tx_words.append(frozenset(_TOKEN_RE.findall(self._tx_desc_lower[-1])))
+        self._tx_kinds.append(_tx_keyword(self._tx_desc_lower[-1]))
+        slot = self._append_tx_postings(self._tx_words[-1])
+        self._tx_by_id.setdefault(new_id, []).append(slot)
+        self._tx_by_norm_id.setdefault(new_id.lower(), []).append(slot)
+        self._amounts_cents = np.append(self._amounts_cents, cents)
+        # Append to CSV, falling back to a full rewrite
+        row = (new_id, new_transaction['amount'], description)
+        if not _append_csv_row('transactions.csv', _TX_CSV_HEADER, row):
+            self.save_to_csv()
         
         # Update the system info in session state
         if 'last_transaction_count' in st.session_state:
@@ -650,20 +780,12 @@ class DeelTransactionSystem:
         
         return new_id, new_transaction
     
+    @_synchronized
     def add_new_user(self, name):
         """Add a new user"""
-        # Get all numeric parts from existing IDs
-        numeric_ids = []
-        for u in self.users:
-            if u['id']:
-                # Extract numbers from ID
-                numbers = re.findall(r'\d+', u['id'])
-                if numbers:
-                    numeric_ids.extend([int(n) for n in numbers])
-        
-        # Generate new ID
-        if numeric_ids:
-            new_num = max(numeric_ids) + 1
+        # Generate new ID from the highest number found in existing IDs
+        if self._max_user_num is not None:
+            new_num = self._max_user_num + 1
         else:
             new_num = 1001
         
@@ -676,12 +798,18 @@ class DeelTransactionSystem:
         
         # Add to users list
         self.users.append(new_user)
-        # Save to CSV
-        self.save_to_csv()
-        
-        # Update session state
-        if 'system' in st.session_state:
-            st.session_state.system.users = self.users
+        self._data_version += 1
+        self._max_user_num = new_num
+        self._user_sigs.append(self.name_signature(name))
+        self._user_ids_lower.append(new_id.lower())
+        self._user_names_lower.append((name or '').lower())
+        if name:
+            self._named_users += 1
+            self._name_parts_total += len(name.split())
+        self._user_by_id.setdefault(new_id, []).append(self._append_user_bits(self._user_sigs[-1]))
+        # Append to CSV, falling back to a full rewrite
+        if not _append_csv_row('users.csv', _USER_CSV_HEADER, (new_id, name)):
+            self.save_to_csv()
         
         # Update the system info in session state
         if 'last_user_count' in st.session_state:
@@ -689,48 +817,88 @@ class DeelTransactionSystem:
         
         return new_id
     
+    @_synchronized
     def delete_transaction(self, transaction_id):
         """Delete a transaction by ID"""
-        for i, transaction in enumerate(self.transactions):
-            if transaction['id'] == transaction_id:
-                deleted_transaction = self.transactions.pop(i)
-                self.save_to_csv()
-                
-                # Update session state
-                if 'system' in st.session_state:
-                    st.session_state.system.transactions = self.transactions
-                
-                # Update the system info in session state
-                if 'last_transaction_count' in st.session_state:
-                    st.session_state.last_transaction_count = len(self.transactions)
-                
-                return True, deleted_transaction
-        return False, None
+        slots = self._tx_by_id.get(transaction_id)
+        if not slots:
+            return False, None
+        
+        slot = slots[0]
+        i = self._tx_row(slot)
+        deleted_transaction = self.transactions.pop(i)
+        self._data_version += 1
+        self._tx_names.pop(i)
+        self._tx_desc_lower.pop(i)
+        self._tx_kinds.pop(i)
+        # Drop the slot from its own postings and ID lookups; other slots are unaffected
+        for w in self._tx_words.pop(i):
+            _posting_remove(self._postings, w, slot)
+        _posting_remove(self._tx_by_id, transaction_id, slot)
+        _posting_remove(self._tx_by_norm_id, self._tx_ids_lower.pop(i).strip(), slot)
+        self._tx_slots = np.delete(self._tx_slots, i)
+        self._amounts_cents = np.delete(self._amounts_cents, i)
+        if transaction_id.isdigit() and int(transaction_id) == self._max_tx_id:
+            self._max_tx_id = max((int(t['id']) for t in self.transactions if t['id'] and t['id'].isdigit()), default=None)
+        self.save_to_csv()
+        
+        # Update the system info in session state
+        if 'last_transaction_count' in st.session_state:
+            st.session_state.last_transaction_count = len(self.transactions)
+        
+        return True, deleted_transaction
     
+    @_synchronized
     def delete_user(self, user_id):
         """Delete a user by ID"""
-        for i, user in enumerate(self.users):
-            if user['id'] == user_id:
-                deleted_user = self.users.pop(i)
-                self.save_to_csv()
-                
-                # Update session state
-                if 'system' in st.session_state:
-                    st.session_state.system.users = self.users
-                
-                # Update the system info in session state
-                if 'last_user_count' in st.session_state:
-                    st.session_state.last_user_count = len(self.users)
-                
-                return True, deleted_user
-        return False, None
+        slots = self._user_by_id.get(user_id)
+        if not slots:
+            return False, None
+        
+        slot = slots[0]
+        i = int(np.searchsorted(self._user_slots, slot))
+        deleted_user = self.users.pop(i)
+        self._data_version += 1
+        self._user_ids_lower.pop(i)
+        self._user_names_lower.pop(i)
+        if deleted_user['name']:
+            self._named_users -= 1
+            self._name_parts_total -= len(deleted_user['name'].split())
+        # Drop the slot from its own postings and ID lookup; other slots are unaffected
+        sig = self._user_sigs.pop(i)
+        if sig is not None:
+            for key in self._name_keys(sig):
+                _posting_remove(self._user_postings, key, slot)
+        _posting_remove(self._user_by_id, user_id, slot)
+        self._user_slots = np.delete(self._user_slots, i)
+        if any(int(n) == self._max_user_num for n in _NUM_RE.findall(user_id)):
+            self._max_user_num = max((int(n) for u in self.users if u['id'] for n in _NUM_RE.findall(u['id'])), default=None)
+        self.save_to_csv()
+        
+        # Update the system info in session state
+        if 'last_user_count' in st.session_state:
+            st.session_state.last_user_count = len(self.users)
+        
+        return True, deleted_user
+
+@st.cache_resource(show_spinner=False)
+def _load_system():
+    """One DeelTransactionSystem (data plus indexes) shared by every session"""
+    return DeelTransactionSystem()
+
+def _on_delete_transaction(transaction_id, result_key='deleted_transaction'):
+    """Delete button callback; runs before the script, so the page renders without the row"""
+    st.session_state[result_key] = _load_system().delete_transaction(transaction_id)
+
+def _on_delete_user(user_id, result_key='deleted_user'):
+    """Delete button callback; runs before the script, so the page renders without the user"""
+    st.session_state[result_key] = _load_system().delete_user(user_id)
 
 def main():
     """Main Streamlit App"""
     
-    # Initialize session state
-    if 'system' not in st.session_state:
-        st.session_state.system = DeelTransactionSystem()
+    # Shared system, built once per process and reused across reruns and sessions
+    system = _load_system()
     
     # Initialize form states
     if 'add_user_submitted' not in st.session_state:
@@ -744,11 +912,9 @@ def main():
     
     # Store current counts in session state for immediate updates
     if 'last_transaction_count' not in st.session_state:
-        st.session_state.last_transaction_count = len(st.session_state.system.transactions)
+        st.session_state.last_transaction_count = len(system.transactions)
     if 'last_user_count' not in st.session_state:
-        st.session_state.last_user_count = len(st.session_state.system.users)
-    
-    system = st.session_state.system
+        st.session_state.last_user_count = len(system.users)
     
     # Sidebar Navigation
     st.sidebar.markdown("""
@@ -776,7 +942,7 @@ def main():
     st.session_state.last_transaction_count = current_transaction_count
     st.session_state.last_user_count = current_user_count
     
-    # Display metrics with updated counts
+    # Display metrics with updated counts (delete callbacks have already run)
     st.sidebar.metric("Total Transactions", current_transaction_count)
     st.sidebar.metric("Total Users", current_user_count)
     
@@ -798,7 +964,7 @@ def main():
                 <h3>📊 Total Amount</h3>
                 <h2>${:,.2f}</h2>
             </div>
-            """.format(sum(t['amount'] for t in system.transactions)), unsafe_allow_html=True)
+            """.format(system.total_amount), unsafe_allow_html=True)
         
         with col2:
             st.markdown("""
@@ -806,7 +972,7 @@ def main():
                 <h3>📈 Avg Transaction</h3>
                 <h2>${:,.2f}</h2>
             </div>
-            """.format(sum(t['amount'] for t in system.transactions)/len(system.transactions) if system.transactions else 0), unsafe_allow_html=True)
+            """.format(system.avg_amount), unsafe_allow_html=True)
         
         with col3:
             st.markdown("""
@@ -824,8 +990,8 @@ def main():
                 "system_summary": {
                     "total_transactions": len(system.transactions),
                     "total_users": len(system.users),
-                    "total_amount": sum(t['amount'] for t in system.transactions),
-                    "average_transaction": sum(t['amount'] for t in system.transactions)/len(system.transactions) if system.transactions else 0
+                    "total_amount": system.total_amount,
+                    "average_transaction": system.avg_amount
                 },
                 "recent_transactions": [
                     {
@@ -1031,14 +1197,15 @@ def main():
                     if amount and description:
                         with st.spinner("Adding transaction..."):
                             new_id, new_transaction = system.add_new_transaction(amount, description)
+                            matches, extracted_name, _ = system.find_user_matches_for_transaction(description)
                             
                             # Store result in session state
                             st.session_state.new_transaction_data = {
                                 'transaction_id': new_id,
                                 'amount': amount,
                                 'description': description,
-                                'matches': system.find_user_matches_for_transaction(description)[0],
-                                'extracted_name': system.find_user_matches_for_transaction(description)[1]
+                                'matches': matches,
+                                'extracted_name': extracted_name
                             }
                             st.session_state.add_transaction_submitted = True
                             
@@ -1195,44 +1362,56 @@ def main():
             st.markdown("<h3 class='sub-header'>Search Transaction</h3>", unsafe_allow_html=True)
             search_term = st.text_input("Search transaction by ID or description:", key="search_trans_del")
             
+            # Outcome of a Delete button clicked for this run (see _on_delete_transaction)
+            deleted = st.session_state.pop('deleted_transaction', None)
+            if deleted:
+                success, deleted_transaction = deleted
+                if success:
+                    st.markdown(f"""
+                    <div class='success-box'>
+                        ✅ Transaction deleted successfully!<br>
+                        <strong>ID:</strong> {deleted_transaction['id']}<br>
+                        <strong>Amount:</strong> ${deleted_transaction['amount']:.2f}
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    st.error("Failed to delete transaction.")
+            
             filtered_transactions = []
             if search_term:
-                filtered_transactions = [
-                    t for t in system.transactions 
-                    if search_term.lower() in t['id'].lower() or search_term.lower() in t['description'].lower()
-                ]
+                filtered_transactions = system.search_transactions(search_term, match_id=True, limit=_DELETE_SEARCH_LIMIT)
             else:
                 filtered_transactions = system.transactions[-10:]  # Show last 10 if no search
             
             if filtered_transactions:
                 st.write(f"Found {len(filtered_transactions)} transactions")
-                for t in filtered_transactions:
-                    with st.container():
-                        col_a, col_b = st.columns([3, 1])
-                        with col_a:
-                            st.markdown(f"""
-                            <div class='transaction-card'>
-                                <strong>ID:</strong> {t['id']}<br>
-                                <strong>Amount:</strong> ${t['amount']:.2f}<br>
-                                <strong>Description:</strong> {t['description'][:100]}...
-                            </div>
-                            """, unsafe_allow_html=True)
-                        with col_b:
-                            if st.button(f"Delete", key=f"del_trans_{t['id']}"):
-                                with st.spinner("Deleting transaction..."):
-                                    success, deleted_transaction = system.delete_transaction(t['id'])
-                                    if success:
-                                        st.markdown(f"""
-                                        <div class='success-box'>
-                                            ✅ Transaction deleted successfully!<br>
-                                            <strong>ID:</strong> {deleted_transaction['id']}<br>
-                                            <strong>Amount:</strong> ${deleted_transaction['amount']:.2f}
-                                        </div>
-                                        """, unsafe_allow_html=True)
-                                        # Force rerun to update sidebar
-                                        st.rerun()
-                                    else:
-                                        st.error("Failed to delete transaction.")
+                if search_term and len(filtered_transactions) == _DELETE_SEARCH_LIMIT:
+                    st.info(f"Showing the first {_DELETE_SEARCH_LIMIT} matches; refine the search to narrow them down.")
+                
+                # Pagination; only the current page's cards are rendered
+                items_per_page = 20
+                start_idx = 0
+                if len(filtered_transactions) > items_per_page:
+                    total_pages = (len(filtered_transactions) + items_per_page - 1) // items_per_page
+                    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="del_trans_page")
+                    start_idx = (page - 1) * items_per_page
+                
+                page_transactions = filtered_transactions[start_idx:start_idx + items_per_page]
+                
+                # All cards in one markdown element, then a compact grid of delete buttons
+                st.markdown("".join(f"""
+                <div class='transaction-card'>
+                    <strong>ID:</strong> {t['id']}<br>
+                    <strong>Amount:</strong> ${t['amount']:.2f}<br>
+                    <strong>Description:</strong> {t['description'][:100]}...
+                </div>
+                """ for t in page_transactions), unsafe_allow_html=True)
+                
+                button_cols = st.columns(4)
+                for i, t in enumerate(page_transactions):
+                    with button_cols[i % 4]:
+                        st.button(f"Delete {t['id']}", key=f"del_trans_{t['id']}",
+                                  on_click=_on_delete_transaction, args=(t['id'],))
             else:
                 st.warning("No transactions found.")
         
@@ -1244,38 +1423,36 @@ def main():
             # Create a unique key for the delete button
             delete_key = f"delete_trans_{transaction_id_to_delete}"
             
-            if st.button("🗑️ Delete Transaction", key=delete_key, type="primary", use_container_width=True, disabled=not confirm):
+            if st.button("🗑️ Delete Transaction", key=delete_key, type="primary", use_container_width=True, disabled=not confirm,
+                         on_click=_on_delete_transaction, args=(transaction_id_to_delete, 'deleted_transaction_by_id')):
+                # The callback has already deleted it; show its outcome
+                success, deleted_transaction = st.session_state.pop('deleted_transaction_by_id', (False, None))
                 if transaction_id_to_delete:
-                    with st.spinner("Deleting transaction..."):
-                        success, deleted_transaction = system.delete_transaction(transaction_id_to_delete)
-                        if success:
-                            st.markdown(f"""
-                            <div class='success-box'>
-                                ✅ Transaction deleted successfully!<br>
-                                <strong>ID:</strong> {deleted_transaction['id']}<br>
-                                <strong>Amount:</strong> ${deleted_transaction['amount']:.2f}<br>
-                                <strong>Description:</strong> {deleted_transaction['description'][:50]}...
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # Show JSON output
-                            st.markdown("<h3 class='sub-header'>Deletion JSON</h3>", unsafe_allow_html=True)
-                            deletion_json = {
-                                "transaction_deleted": True,
-                                "deleted_transaction": deleted_transaction,
-                                "remaining_transactions": len(system.transactions)
-                            }
-                            display_json(deletion_json, "Transaction Deletion Result")
-                            
-                            # Force rerun to update sidebar
-                            st.rerun()
-                        else:
-                            st.markdown("""
-                            <div class='error-box'>
-                                ❌ Transaction not found!<br>
-                                Please check the Transaction ID.
-                            </div>
-                            """, unsafe_allow_html=True)
+                    if success:
+                        st.markdown(f"""
+                        <div class='success-box'>
+                            ✅ Transaction deleted successfully!<br>
+                            <strong>ID:</strong> {deleted_transaction['id']}<br>
+                            <strong>Amount:</strong> ${deleted_transaction['amount']:.2f}<br>
+                            <strong>Description:</strong> {deleted_transaction['description'][:50]}...
+                        </div>
+                        """, unsafe_allow_html=True)
+                        
+                        # Show JSON output
+                        st.markdown("<h3 class='sub-header'>Deletion JSON</h3>", unsafe_allow_html=True)
+                        deletion_json = {
+                            "transaction_deleted": True,
+                            "deleted_transaction": deleted_transaction,
+                            "remaining_transactions": len(system.transactions)
+                        }
+                        display_json(deletion_json, "Transaction Deletion Result")
+                    else:
+                        st.markdown("""
+                        <div class='error-box'>
+                            ❌ Transaction not found!<br>
+                            Please check the Transaction ID.
+                        </div>
+                        """, unsafe_allow_html=True)
                 else:
                     st.warning("Please enter a Transaction ID")
     
@@ -1288,43 +1465,53 @@ def main():
             st.markdown("<h3 class='sub-header'>Search User</h3>", unsafe_allow_html=True)
             search_term = st.text_input("Search user by ID or name:", key="search_user_del")
             
+            # Outcome of a Delete button clicked for this run (see _on_delete_user)
+            deleted = st.session_state.pop('deleted_user', None)
+            if deleted:
+                success, deleted_user = deleted
+                if success:
+                    st.markdown(f"""
+                    <div class='success-box'>
+                        ✅ User deleted successfully!<br>
+                        <strong>ID:</strong> {deleted_user['id']}<br>
+                        <strong>Name:</strong> {deleted_user['name']}
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    st.error("Failed to delete user.")
+            
             filtered_users = []
             if search_term:
-                filtered_users = [
-                    u for u in system.users 
-                    if search_term.lower() in u['id'].lower() or search_term.lower() in u['name'].lower()
-                ]
+                filtered_users = system.search_users(search_term, match_id=True)
             else:
                 filtered_users = system.users[-10:]  # Show last 10 if no search
             
             if filtered_users:
                 st.write(f"Found {len(filtered_users)} users")
-                for u in filtered_users:
-                    with st.container():
-                        col_a, col_b = st.columns([3, 1])
-                        with col_a:
-                            st.markdown(f"""
-                            <div class='transaction-card'>
-                                <strong>ID:</strong> {u['id']}<br>
-                                <strong>Name:</strong> {u['name']}
-                            </div>
-                            """, unsafe_allow_html=True)
-                        with col_b:
-                            if st.button(f"Delete", key=f"del_user_{u['id']}"):
-                                with st.spinner("Deleting user..."):
-                                    success, deleted_user = system.delete_user(u['id'])
-                                    if success:
-                                        st.markdown(f"""
-                                        <div class='success-box'>
-                                            ✅ User deleted successfully!<br>
-                                            <strong>ID:</strong> {deleted_user['id']}<br>
-                                            <strong>Name:</strong> {deleted_user['name']}
-                                        </div>
-                                        """, unsafe_allow_html=True)
-                                        # Force rerun to update sidebar
-                                        st.rerun()
-                                    else:
-                                        st.error("Failed to delete user.")
+                
+                # Pagination; only the current page's cards are rendered
+                items_per_page = 20
+                start_idx = 0
+                if len(filtered_users) > items_per_page:
+                    total_pages = (len(filtered_users) + items_per_page - 1) // items_per_page
+                    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="del_user_page")
+                    start_idx = (page - 1) * items_per_page
+                
+                page_users = filtered_users[start_idx:start_idx + items_per_page]
+                
+                # All cards in one markdown element, then a compact grid of delete buttons
+                st.markdown("".join(f"""
+                <div class='transaction-card'>
+                    <strong>ID:</strong> {u['id']}<br>
+                    <strong>Name:</strong> {u['name']}
+                </div>
+                """ for u in page_users), unsafe_allow_html=True)
+                
+                button_cols = st.columns(4)
+                for i, u in enumerate(page_users):
+                    with button_cols[i % 4]:
+                        st.button(f"Delete {u['id']}", key=f"del_user_{u['id']}",
+                                  on_click=_on_delete_user, args=(u['id'],))
             else:
                 st.warning("No users found.")
         
@@ -1336,37 +1523,35 @@ def main():
             # Create a unique key for the delete button
             delete_key = f"delete_user_{user_id_to_delete}"
             
-            if st.button("🗑️ Delete User", key=delete_key, type="primary", use_container_width=True, disabled=not confirm):
+            if st.button("🗑️ Delete User", key=delete_key, type="primary", use_container_width=True, disabled=not confirm,
+                         on_click=_on_delete_user, args=(user_id_to_delete, 'deleted_user_by_id')):
+                # The callback has already deleted it; show its outcome
+                success, deleted_user = st.session_state.pop('deleted_user_by_id', (False, None))
                 if user_id_to_delete:
-                    with st.spinner("Deleting user..."):
-                        success, deleted_user = system.delete_user(user_id_to_delete)
-                        if success:
-                            st.markdown(f"""
-                            <div class='success-box'>
-                                ✅ User deleted successfully!<br>
-                                <strong>ID:</strong> {deleted_user['id']}<br>
-                                <strong>Name:</strong> {deleted_user['name']}
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # Show JSON output
-                            st.markdown("<h3 class='sub-header'>Deletion JSON</h3>", unsafe_allow_html=True)
-                            deletion_json = {
-                                "user_deleted": True,
-                                "deleted_user": deleted_user,
-                                "remaining_users": len(system.users)
-                            }
-                            display_json(deletion_json, "User Deletion Result")
-                            
-                            # Force rerun to update sidebar
-                            st.rerun()
-                        else:
-                            st.markdown("""
-                            <div class='error-box'>
-                                ❌ User not found!<br>
-                                Please check the User ID.
-                            </div>
-                            """, unsafe_allow_html=True)
+                    if success:
+                        st.markdown(f"""
+                        <div class='success-box'>
+                            ✅ User deleted successfully!<br>
+                            <strong>ID:</strong> {deleted_user['id']}<br>
+                            <strong>Name:</strong> {deleted_user['name']}
+                        </div>
+                        """, unsafe_allow_html=True)
+                        
+                        # Show JSON output
+                        st.markdown("<h3 class='sub-header'>Deletion JSON</h3>", unsafe_allow_html=True)
+                        deletion_json = {
+                            "user_deleted": True,
+                            "deleted_user": deleted_user,
+                            "remaining_users": len(system.users)
+                        }
+                        display_json(deletion_json, "User Deletion Result")
+                    else:
+                        st.markdown("""
+                        <div class='error-box'>
+                            ❌ User not found!<br>
+                            Please check the User ID.
+                        </div>
+                        """, unsafe_allow_html=True)
                 else:
                     st.warning("Please enter a User ID")
     
@@ -1376,7 +1561,7 @@ def main():
         search_term = st.text_input("Search in transactions:", key="search_trans_view")
         
         if search_term:
-            filtered_transactions = [t for t in system.transactions if search_term.lower() in t['description'].lower()]
+            filtered_transactions = system.search_transactions(search_term)
         else:
             filtered_transactions = system.transactions
         
@@ -1387,33 +1572,22 @@ def main():
             transactions_json = {
                 "total_transactions": len(filtered_transactions),
                 "search_term": search_term if search_term else "All",
-                "transactions": [
-                    {
-                        "id": t['id'],
-                        "amount": t['amount'],
-                        "description": t['description']
-                    } for t in filtered_transactions
-                ]
+                # Records already hold exactly id/amount/description, so no projection copy
+                "transactions": filtered_transactions
             }
             display_json(transactions_json, "All Transactions")
         
-        # Pagination
-        items_per_page = 20
-        total_pages = max(1, (len(filtered_transactions) + items_per_page - 1) // items_per_page)
-        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="trans_page")
-        
-        start_idx = (page - 1) * items_per_page
-        end_idx = min(start_idx + items_per_page, len(filtered_transactions))
-        
-        for t in filtered_transactions[start_idx:end_idx]:
-            with st.container():
-                st.markdown(f"""
-                <div class='transaction-card'>
-                    <strong>ID:</strong> {t['id']}<br>
-                    <strong>Amount:</strong> ${t['amount']:.2f}<br>
-                    <strong>Description:</strong> {t['description']}
-                </div>
-                """, unsafe_allow_html=True)
+        # Scrollable table; the frontend only renders the visible rows
+        st.dataframe(
+            system.transactions_frame(search_term),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "id": st.column_config.TextColumn("ID"),
+                "amount": st.column_config.NumberColumn("Amount", format="$%.2f"),
+                "description": st.column_config.TextColumn("Description"),
+            },
+        )
     
     elif menu == "View Users":
         st.markdown("<h1 class='main-header'>👥 All Users</h1>", unsafe_allow_html=True)
@@ -1421,7 +1595,7 @@ def main():
         search_term = st.text_input("Search in users:", key="search_users_view")
         
         if search_term:
-            filtered_users = [u for u in system.users if search_term.lower() in u['name'].lower()]
+            filtered_users = system.search_users(search_term)
         else:
             filtered_users = system.users
         
@@ -1441,15 +1615,23 @@ def main():
             }
             display_json(users_json, "All Users")
         
-        col1, col2, col3 = st.columns(3)
-        for i, user in enumerate(filtered_users):
-            with col1 if i % 3 == 0 else col2 if i % 3 == 1 else col3:
-                st.markdown(f"""
-                <div style='padding: 0.5rem; background: #F1F5F9; border-radius: 0.5rem; margin: 0.5rem 0;'>
-                    <strong>{user['name']}</strong><br>
-                    <small>ID: {user['id']}</small>
-                </div>
-                """, unsafe_allow_html=True)
+        # Pagination (a multiple of 3 keeps the grid rows full)
+        items_per_page = 30
+        total_pages = max(1, (len(filtered_users) + items_per_page - 1) // items_per_page)
+        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key="users_page")
+        
+        start_idx = (page - 1) * items_per_page
+        end_idx = min(start_idx + items_per_page, len(filtered_users))
+        page_users = filtered_users[start_idx:end_idx]
+        
+        # Card i goes in column i % 3, so each column takes every third user in one markdown call
+        for col, col_users in zip(st.columns(3), (page_users[0::3], page_users[1::3], page_users[2::3])):
+            col.markdown("".join(f"""
+            <div class='user-card'>
+                <strong>{user['name']}</strong><br>
+                <small>ID: {user['id']}</small>
+            </div>
+            """ for user in col_users), unsafe_allow_html=True)
     
     elif menu == "Statistics":
         st.markdown("<h1 class='main-header'>📈 System Statistics</h1>", unsafe_allow_html=True)
@@ -1459,10 +1641,10 @@ def main():
         with col1:
             st.markdown("### 📊 Transaction Statistics")
             if system.transactions:
-                total_amount = sum(t['amount'] for t in system.transactions)
-                avg_amount = total_amount / len(system.transactions)
-                min_trans = min(system.transactions, key=lambda x: x['amount'])
-                max_trans = max(system.transactions, key=lambda x: x['amount'])
+                total_amount = system.total_amount
+                avg_amount = system.avg_amount
+                min_trans = system.min_transaction
+                max_trans = system.max_transaction
                 
                 st.metric("Total Amount", f"${total_amount:,.2f}")
                 st.metric("Average Transaction", f"${avg_amount:,.2f}")
@@ -1476,22 +1658,13 @@ def main():
             st.metric("Total Users", len(system.users))
             
             # Count by name length
-            name_lengths = [len(u['name'].split()) for u in system.users if u['name']]
-            if name_lengths:
-                avg_name_parts = sum(name_lengths) / len(name_lengths)
+            avg_name_parts = system.avg_name_parts
+            if avg_name_parts is not None:
                 st.metric("Avg Name Parts", f"{avg_name_parts:.1f}")
         
         # Transaction types
         st.markdown("### 🔤 Transaction Types")
-        keyword_counts = defaultdict(int)
-        keywords = ['payment', 'salary', 'contract', 'invoice', 'bonus', 'transfer', 'received', 'request']
-        
-        for t in system.transactions:
-            desc_lower = t['description'].lower()
-            for keyword in keywords:
-                if keyword in desc_lower:
-                    keyword_counts[keyword] += 1
-                    break
+        keyword_counts = system.keyword_counts
         
         if keyword_counts:
             cols = st.columns(len(keyword_counts))
@@ -1517,7 +1690,7 @@ def main():
                 },
                 "user_statistics": {
                     "total_users": len(system.users),
-                    "average_name_parts": avg_name_parts if name_lengths else 0
+                    "average_name_parts": avg_name_parts if avg_name_parts is not None else 0
                 },
                 "transaction_types": keyword_counts
             }